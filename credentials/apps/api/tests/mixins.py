@@ -2,7 +2,6 @@
 Mixins for Credentials API tests.
 """
 
-import json
 from time import time
 
 import jwt
@@ -102,8 +101,8 @@ class CredentialViewSetTestsMixin:
     def assert_list_with_status_filter(self, data, should_exist=True):
         """Helper method for making request and assertions."""
         expected = self._generate_results(should_exist)
-        response = self.client.get(self.list_path, data, expected)
-        self.assertEqual(json.loads(response.content), expected)
+        response = self.client.get(self.list_path, data)
+        self.assertEqual(response.data, expected)
 
     def _generate_results(self, exists=True):
         if exists:
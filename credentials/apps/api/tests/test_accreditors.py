@@ -5,7 +5,6 @@ Tests for the accreditor module.
 from unittest.mock import patch
 
 from django.test import TestCase
-from testfixtures import LogCapture
 
 from credentials.apps.api.accreditors import Accreditor
 from credentials.apps.api.exceptions import UnsupportedCredentialTypeError
@@ -63,9 +62,9 @@ class AccreditorTests(TestCase):
             )
         )
 
-        with LogCapture(LOGGER_NAME) as lc:
+        with self.assertLogs(LOGGER_NAME, level="WARNING") as lc:
             accreditor = Accreditor(issuers=[ProgramCertificateIssuer(), ProgramCertificateIssuer()])
-            lc.check((LOGGER_NAME, "WARNING", msg))
+        self.assertEqual(lc.output, [f"WARNING:{LOGGER_NAME}:{msg}"])
         expected = {self.program_credential: accreditor.issuers[0]}
         self.assertEqual(accreditor.credential_type_issuer_map, expected)
 
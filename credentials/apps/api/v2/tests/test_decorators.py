@@ -7,12 +7,14 @@ from django.http import HttpResponse
 from django.test import TestCase
 from django.test.client import RequestFactory
 from edx_toggles.toggles.testutils import override_waffle_switch
-from testfixtures import LogCapture
 
 from credentials.apps.api.v2.decorators import log_incoming_request
 from credentials.apps.core.tests.factories import UserFactory
 
 
+LOGGER_NAME = "credentials.apps.api.v2.decorators"
+
+
 class CredentialsApiDecoratorTests(TestCase):
     """
     Unit tests for the API app's `decorators.py` file.
@@ -41,7 +43,7 @@ class CredentialsApiDecoratorTests(TestCase):
 
         args = (None, self.request)
         kwargs = {}
-        with LogCapture() as log:
+        with self.assertLogs(LOGGER_NAME, level="INFO") as log:
             decorated_view(*args, **kwargs)
 
         assert log.records[0].msg == expected_msg
@@ -56,11 +58,9 @@ class CredentialsApiDecoratorTests(TestCase):
 
         args = (None, self.request)
         kwargs = {}
-        with LogCapture() as log:
+        with self.assertNoLogs(LOGGER_NAME):
             decorated_view(*args, **kwargs)
 
-        assert log.records == []
-
     @override_waffle_switch(settings.LOG_INCOMING_REQUESTS, active=True)
     def test_log_incoming_requests_decorator_with_exception(self):
         """
@@ -71,7 +71,7 @@ class CredentialsApiDecoratorTests(TestCase):
 
         decorated_view = log_incoming_request(self._test_view)
 
-        with LogCapture() as log:
+        with self.assertLogs(LOGGER_NAME, level="INFO") as log:
             response = decorated_view(None, None)
 
         assert log.records[0].msg == expected_msg
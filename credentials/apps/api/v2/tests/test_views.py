@@ -1,17 +1,17 @@
+import copy
 import datetime
 import json
 from decimal import Decimal
 from unittest import mock
 
-import ddt
 import pytz
 from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework.renderers import JSONRenderer
-from rest_framework.test import APIRequestFactory, APITestCase
-from testfixtures import LogCapture
+from rest_framework.test import APIClient, APIRequestFactory, APITestCase, force_authenticate
 from waffle.testutils import override_switch
 
 from credentials.apps.api.tests.mixins import JwtMixin
@@ -20,8 +20,9 @@ from credentials.apps.api.v2.serializers import (
     UserCredentialSerializer,
     UserGradeSerializer,
 )
-from credentials.apps.api.v2.views import CredentialRateThrottle
+from credentials.apps.api.v2.views import CredentialRateThrottle, CredentialViewSet, GradeViewSet
 from credentials.apps.catalog.tests.factories import CourseFactory, CourseRunFactory, ProgramFactory
+from credentials.apps.core.models import User
 from credentials.apps.core.tests.factories import USER_PASSWORD, UserFactory
 from credentials.apps.core.tests.mixins import SiteMixin
 from credentials.apps.credentials.models import UserCredential
@@ -39,14 +40,59 @@ JSON_CONTENT_TYPE = "application/json"
 LOGGER_NAME = "credentials.apps.credentials.issuers"
 LOGGER_NAME_SERIALIZER = "credentials.apps.api.v2.serializers"
 
+# Common shape of the credential creation POST body; tests deepcopy this and override fields.
+BASE_CREATE_PAYLOAD = {
+    "username": "test-user",
+    "lms_user_id": 123,
+    "credential": None,
+    "status": "awarded",
+    "date_override": None,
+    "attributes": [
+        {
+            "name": "fake-name",
+            "value": "fake-value",
+        }
+    ],
+}
+
 
-@ddt.ddt
 class CredentialViewSetTests(SiteMixin, APITestCase):
     list_path = reverse("api:v2:credentials-list")
+    # Resolve the detail route once per class; reverse() walks the resolver tree on every call.
+    detail_path_template = reverse("api:v2:credentials-detail", kwargs={"uuid": "placeholder"}).replace(
+        "placeholder", "{uuid}"
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # One client for the whole class; the only per-test state is the login session,
+        # which tearDown clears.
+        cls.shared_client = APIClient(SERVER_NAME=cls.domain)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # The tests only need a username and a login; skip the factory's Faker fields.
+        cls.user = User.objects.create_user("credential-viewset-user", password=USER_PASSWORD)
+        # Fetch the permissions the tests grant with a single SELECT, instead of one per call.
+        cls.permissions = {
+            permission.codename: permission
+            for permission in Permission.objects.filter(codename__endswith="_usercredential")
+        }
 
     def setUp(self):
         super().setUp()
-        self.user = UserFactory()
+        # Keep assertNumQueries deterministic regardless of which tests ran earlier in the process.
+        ContentType.objects.clear_cache()
+
+    def tearDown(self):
+        self.shared_client.logout()
+        super().tearDown()
+
+    def detail_path(self, credential):
+        """Return the detail URL for the given credential from the cached template."""
+        return self.detail_path_template.format(uuid=credential.uuid)
 
     def serialize_user_credential(self, user_credential, many=False):
         """Serialize the given UserCredential object(s)."""
@@ -60,7 +106,7 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
 
     def add_user_permission(self, user, permission):
         """Assigns a permission of the given name to the user."""
-        user.user_permissions.add(Permission.objects.get(codename=permission))
+        user.user_permissions.add(self.permissions[permission])
 
     def assert_access_denied(self, user, method, path, data=None):
         """Asserts the given user cannot access the given path via the specified HTTP action/method."""
@@ -85,21 +131,11 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
         program = ProgramFactory(site=self.site)
         program_certificate = ProgramCertificateFactory(site=self.site, program_uuid=program.uuid, program=program)
         expected_username = self.user.username
-        expected_attribute_name = "fake-name"
-        expected_attribute_value = "fake-value"
-        data = {
-            "username": expected_username,
-            "lms_user_id": 123,
-            "credential": {"program_uuid": str(program_certificate.program_uuid)},
-            "status": "awarded",
-            "date_override": None,
-            "attributes": [
-                {
-                    "name": expected_attribute_name,
-                    "value": expected_attribute_value,
-                }
-            ],
-        }
+        expected_attribute_name = BASE_CREATE_PAYLOAD["attributes"][0]["name"]
+        expected_attribute_value = BASE_CREATE_PAYLOAD["attributes"][0]["value"]
+        data = copy.deepcopy(BASE_CREATE_PAYLOAD)
+        data["username"] = expected_username
+        data["credential"] = {"program_uuid": str(program_certificate.program_uuid)}
 
         # Verify users without the add permission are denied access
         self.assert_access_denied(self.user, "post", self.list_path, data=data)
@@ -124,21 +160,18 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
         """Verify an error is returned if an attempt is made to create a UserCredential with multiple attributes
         of the same name."""
         program_certificate = ProgramCertificateFactory(site=self.site)
-        data = {
-            "username": "test-user",
-            "lms_user_id": 123,
-            "credential": {"program_uuid": str(program_certificate.program_uuid)},
-            "attributes": [
-                {
-                    "name": "attr-name",
-                    "value": "attr-value",
-                },
-                {
-                    "name": "attr-name",
-                    "value": "another-attr-value",
-                },
-            ],
-        }
+        data = copy.deepcopy(BASE_CREATE_PAYLOAD)
+        data["credential"] = {"program_uuid": str(program_certificate.program_uuid)}
+        data["attributes"] = [
+            {
+                "name": "attr-name",
+                "value": "attr-value",
+            },
+            {
+                "name": "attr-name",
+                "value": "another-attr-value",
+            },
+        ]
 
         self.authenticate_user(self.user)
         self.add_user_permission(self.user, "add_usercredential")
@@ -183,21 +216,10 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
         course_run = CourseRunFactory.create(course=course)
 
         expected_date_override = "9999-05-11T00:00:00Z"
-        expected_attribute_name = "fake-name"
-        expected_attribute_value = "fake-value"
-        data = {
-            "username": self.user.username,
-            "lms_user_id": 123,
-            "credential": {"course_run_key": course_run.key, "mode": "verified", "type": "course-run"},
-            "status": "awarded",
-            "date_override": {"date": expected_date_override},
-            "attributes": [
-                {
-                    "name": expected_attribute_name,
-                    "value": expected_attribute_value,
-                }
-            ],
-        }
+        data = copy.deepcopy(BASE_CREATE_PAYLOAD)
+        data["username"] = self.user.username
+        data["credential"] = {"course_run_key": course_run.key, "mode": "verified", "type": "course-run"}
+        data["date_override"] = {"date": expected_date_override}
 
         self.authenticate_user(self.user)
         self.add_user_permission(self.user, "add_usercredential")
@@ -221,7 +243,7 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
         credential = UserCredentialFactory(
             credential__site=self.site, status=UserCredential.AWARDED, username=self.user.username
         )
-        path = reverse("api:v2:credentials-detail", kwargs={"uuid": credential.uuid})
+        path = self.detail_path(credential)
 
         # Verify users without the view permission are denied access
         self.assert_access_denied(self.user, "delete", path)
@@ -238,14 +260,16 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
     def test_retrieve(self):
         """Verify the endpoint returns data for a single UserCredential."""
         credential = UserCredentialFactory(credential__site=self.site, username=self.user.username)
-        path = reverse("api:v2:credentials-detail", kwargs={"uuid": credential.uuid})
+        path = self.detail_path(credential)
 
         # Verify users without the view permission are denied access
         self.assert_access_denied(self.user, "get", path)
 
         self.authenticate_user(self.user)
         self.add_user_permission(self.user, "view_usercredential")
-        response = self.client.get(path)
+        # Locks in the current query count so serializer changes cannot silently reintroduce N+1s.
+        with self.assertNumQueries(8):
+            response = self.client.get(path)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data, self.serialize_user_credential(credential))
 
@@ -264,14 +288,27 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
 
     def test_list_status_filtering(self):
         """Verify the endpoint returns data for all UserCredentials that match the specified status."""
-        awarded = UserCredentialFactory.create_batch(3, credential__site=self.site, status=UserCredential.AWARDED)
-        revoked = UserCredentialFactory.create_batch(3, credential__site=self.site, status=UserCredential.REVOKED)
+        # Only the status matters here, so share one certificate and insert the credentials in two batches.
+        program_certificate = ProgramCertificateFactory(site=self.site)
+        awarded = UserCredential.objects.bulk_create(
+            UserCredential(credential=program_certificate, username=f"robot{n}", status=UserCredential.AWARDED)
+            for n in range(3)
+        )
+        revoked = UserCredential.objects.bulk_create(
+            UserCredential(credential=program_certificate, username=f"robot{n + 3}", status=UserCredential.REVOKED)
+            for n in range(3)
+        )
 
         self.authenticate_user(self.user)
         self.add_user_permission(self.user, "view_usercredential")
 
+        # Warm the per-process waffle/site caches so the query count below is the steady state.
+        self.client.get(self.list_path)
+
         for status, expected in (("awarded", awarded), ("revoked", revoked)):
-            response = self.client.get(self.list_path + f"?status={status}")
+            # Locks in the current query count so serializer changes cannot silently reintroduce N+1s.
+            with self.assertNumQueries(8):
+                response = self.client.get(self.list_path + f"?status={status}")
             self.assertEqual(response.status_code, 200)
             self.assertEqual(response.data["results"], self.serialize_user_credential(expected, many=True))
 
@@ -390,25 +427,35 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data["results"], self.serialize_user_credential(both, many=True))
 
-    @ddt.data("put", "patch")
-    def test_update(self, method):
+    def test_update(self):
         """Verify the endpoint supports updating the status of a UserCredential, but no other fields."""
         credential = UserCredentialFactory(credential__site=self.site, username=self.user.username)
-        path = reverse("api:v2:credentials-detail", kwargs={"uuid": credential.uuid})
+        path = self.detail_path(credential)
         expected_status = UserCredential.REVOKED
         data = {"status": expected_status}
 
         # Verify users without the change permission are denied access
-        self.assert_access_denied(self.user, method, path, data=data)
+        for method in ("put", "patch"):
+            with self.subTest(method=method):
+                self.assert_access_denied(self.user, method, path, data=data)
 
-        self.authenticate_user(self.user)
         self.add_user_permission(self.user, "change_usercredential")
-        response = getattr(self.client, method)(path, data=data)
-        credential.refresh_from_db()
-
-        self.assertEqual(credential.status, expected_status)
-        self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.data, self.serialize_user_credential(credential))
+        # The authorized iterations only exercise view/serializer behavior, so call the view
+        # directly instead of dispatching through the URL resolver and middleware stack. The
+        # site attribute is normally set by CurrentSiteMiddleware.
+        factory = APIRequestFactory(SERVER_NAME=self.site.domain)
+        view = CredentialViewSet.as_view({"put": "update", "patch": "partial_update"})
+        for method in ("put", "patch"):
+            with self.subTest(method=method):
+                request = getattr(factory, method)(path, data, format="json")
+                force_authenticate(request, user=self.user)
+                request.site = self.site
+                response = view(request, uuid=str(credential.uuid))
+                credential.refresh_from_db()
+
+                self.assertEqual(credential.status, expected_status)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data, self.serialize_user_credential(credential))
 
     def test_site_filtering(self):
         """Verify the endpoint only returns credentials linked to a single site."""
@@ -425,15 +472,35 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
         self.assertEqual(response.data["results"][0], self.serialize_user_credential(credential))
 
 
-@ddt.ddt
 class GradeViewSetTests(SiteMixin, APITestCase):
     list_path = reverse("api:v2:grades-list")
+    # Resolve the detail route once per class; reverse() walks the resolver tree on every call.
+    detail_path_template = reverse("api:v2:grades-detail", kwargs={"pk": "placeholder"}).replace("placeholder", "{pk}")
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # One client for the whole class; the only per-test state is the login session,
+        # which tearDown clears.
+        cls.shared_client = APIClient(SERVER_NAME=cls.domain)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # The tests only need a username and a login; skip the factory's Faker fields.
+        cls.user = User.objects.create_user("grade-viewset-user", password=USER_PASSWORD)
+        # Fetch the permissions the tests grant with a single SELECT, instead of one per call.
+        cls.permissions = {
+            permission.codename: permission for permission in Permission.objects.filter(codename__endswith="_usergrade")
+        }
+        cls.course = CourseFactory(site=cls.site)
+        cls.course_run = CourseRunFactory(course=cls.course)
+        # Shared by test_create_with_existing_user_grade; grades have no list endpoint,
+        # so the extra row cannot leak into other tests' assertions.
+        cls.existing_grade = UserGradeFactory(course_run=cls.course_run)
 
     def setUp(self):
         super().setUp()
-        self.user = UserFactory()
-        self.course = CourseFactory(site=self.site)
-        self.course_run = CourseRunFactory(course=self.course)
         self.data = {
             "username": "test_user",
             "course_run": self.course_run.key,
@@ -441,6 +508,12 @@ class GradeViewSetTests(SiteMixin, APITestCase):
             "percent_grade": 0.9,
             "verified": True,
         }
+        # Several tests post this payload unmodified; encode it once.
+        self.data_json = json.dumps(self.data)
+
+    def tearDown(self):
+        self.shared_client.logout()
+        super().tearDown()
 
     def serialize_user_grade(self, user_grade, many=False):
         """Serialize the given UserGrade object(s)."""
@@ -454,7 +527,7 @@ class GradeViewSetTests(SiteMixin, APITestCase):
 
     def add_user_permission(self, user, permission):
         """Assigns a permission of the given name to the user."""
-        user.user_permissions.add(Permission.objects.get(codename=permission))
+        user.user_permissions.add(self.permissions[permission])
 
     def assert_access_denied(self, user, method, path, data=None):
         """Asserts the given user cannot access the given path via the specified HTTP action/method."""
@@ -467,12 +540,12 @@ class GradeViewSetTests(SiteMixin, APITestCase):
     def test_authentication(self):
         """Verify the endpoint requires an authenticated user."""
         self.client.logout()
-        response = self.client.post(self.list_path, data=json.dumps(self.data), content_type=JSON_CONTENT_TYPE)
+        response = self.client.post(self.list_path, data=self.data_json, content_type=JSON_CONTENT_TYPE)
         self.assertEqual(response.status_code, 401)
 
         superuser = UserFactory(is_staff=True, is_superuser=True)
         self.authenticate_user(superuser)
-        response = self.client.post(self.list_path, data=json.dumps(self.data), content_type=JSON_CONTENT_TYPE)
+        response = self.client.post(self.list_path, data=self.data_json, content_type=JSON_CONTENT_TYPE)
         self.assertEqual(response.status_code, 201)
 
     def test_create(self):
@@ -481,7 +554,7 @@ class GradeViewSetTests(SiteMixin, APITestCase):
 
         self.authenticate_user(self.user)
         self.add_user_permission(self.user, "add_usergrade")
-        response = self.client.post(self.list_path, data=json.dumps(self.data), content_type=JSON_CONTENT_TYPE)
+        response = self.client.post(self.list_path, data=self.data_json, content_type=JSON_CONTENT_TYPE)
         grade = UserGrade.objects.last()
 
         self.assertEqual(response.status_code, 201)
@@ -522,7 +595,7 @@ class GradeViewSetTests(SiteMixin, APITestCase):
         """Verify that, if a user has already been issued a grade, further attempts to issue the same grade
         will NOT create a new grade, but update the fields of the existing grade.
         """
-        grade = UserGradeFactory(course_run=self.course_run)
+        grade = self.existing_grade
         self.authenticate_user(self.user)
         self.add_user_permission(self.user, "add_usergrade")
 
@@ -536,15 +609,14 @@ class GradeViewSetTests(SiteMixin, APITestCase):
         self.assertEqual(grade.letter_grade, "B")
         self.assertDictEqual(response.data, self.serialize_user_grade(grade))
 
-    @ddt.data(True, False)
-    def test_create_with_logging_decorator_enabled(self, decorator_enabled):
+    def test_create_with_logging_decorator(self):
         """
         A test that verifies expected log messages from Grade views decorated with the `log_incoming_requests`
         decorator.
         """
         expected_log_decorator_enabled = (
             f"POST request received to endpoint [/api/v2/grades/] from user [{self.user.username}] originating from "
-            f"[Unknown] with data: [{str.encode(json.dumps(self.data))}]"
+            f"[Unknown] with data: [{str.encode(self.data_json)}]"
         )
         formatted_grade = "{:.4f}".format(self.data["percent_grade"])
         expected_logs = [
@@ -553,41 +625,51 @@ class GradeViewSetTests(SiteMixin, APITestCase):
             f"[{self.data['verified']}], and lms_last_updated_at [None]"
         ]
 
-        if decorator_enabled:
-            expected_logs.append(expected_log_decorator_enabled)
-
         self.authenticate_user(self.user)
         self.add_user_permission(self.user, "add_usergrade")
 
-        with override_switch("api.log_incoming_requests", active=decorator_enabled):
-            with LogCapture() as log:
-                self.client.post(self.list_path, data=json.dumps(self.data), content_type=JSON_CONTENT_TYPE)
+        for decorator_enabled in (True, False):
+            with self.subTest(decorator_enabled=decorator_enabled):
+                expected = expected_logs + ([expected_log_decorator_enabled] if decorator_enabled else [])
 
-        log_messages = [log.msg for log in log.records]
-        for log in expected_logs:
-            assert log in log_messages
+                with override_switch("api.log_incoming_requests", active=decorator_enabled):
+                    with self.assertLogs(level="INFO") as log:
+                        self.client.post(self.list_path, data=self.data_json, content_type=JSON_CONTENT_TYPE)
 
-    @ddt.data("put", "patch")
-    def test_update(self, method):
+                log_messages = [record.msg for record in log.records]
+                for expected_log in expected:
+                    assert expected_log in log_messages
+
+    def test_update(self):
         """Verify the endpoint supports updating the status of a UserGrade, but no other fields."""
         grade = UserGradeFactory(
             course_run=self.course_run,
             username=self.user.username,
             letter_grade="C",
         )
-        path = reverse("api:v2:grades-detail", kwargs={"pk": grade.id})
+        path = self.detail_path_template.format(pk=grade.id)
 
         # Verify users without the change permission are denied access
-        self.assert_access_denied(self.user, method, path, data=self.data)
+        for method in ("put", "patch"):
+            with self.subTest(method=method):
+                self.assert_access_denied(self.user, method, path, data=self.data)
 
-        self.authenticate_user(self.user)
         self.add_user_permission(self.user, "change_usergrade")
-        response = getattr(self.client, method)(path, data=self.data)
-
-        grade.refresh_from_db()
-        self.assertEqual(response.status_code, 200)
-        self.assertEqual(grade.letter_grade, self.data["letter_grade"])
-        self.assertDictEqual(response.data, self.serialize_user_grade(grade))
+        # The authorized iterations only exercise view/serializer behavior, so call the view
+        # directly instead of dispatching through the URL resolver and middleware stack.
+        factory = APIRequestFactory(SERVER_NAME=self.site.domain)
+        view = GradeViewSet.as_view({"put": "update", "patch": "partial_update"})
+        for method in ("put", "patch"):
+            with self.subTest(method=method):
+                request = getattr(factory, method)(path, self.data, format="json")
+                force_authenticate(request, user=self.user)
+                request.site = self.site
+                response = view(request, pk=grade.id)
+
+                grade.refresh_from_db()
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(grade.letter_grade, self.data["letter_grade"])
+                self.assertDictEqual(response.data, self.serialize_user_grade(grade))
 
     def test_upgrade_with_lms_last_updated_at_data(self):
         """Verify the endpoint supports updating the status"""
@@ -608,7 +690,6 @@ class GradeViewSetTests(SiteMixin, APITestCase):
         self.assertEqual(grade.lms_last_updated_at, last_updated_at)
 
 
-@ddt.ddt
 class ThrottlingTests(TestCase):
     """Tests for CredentialRateThrottle."""
 
@@ -616,14 +697,14 @@ class ThrottlingTests(TestCase):
         super().setUp()
         self.throttle = CredentialRateThrottle()
 
-    @ddt.data("credential_view", "grade_view", "staff_override")
-    def test_throttle_configuration(self, scope):
+    def test_throttle_configuration(self):
         """Verify that throttling is configured for each scope."""
-        self.throttle.scope = scope
-        self.assertIsNotNone(self.throttle.parse_rate(self.throttle.get_rate()))
+        for scope in ("credential_view", "grade_view", "staff_override"):
+            with self.subTest(scope=scope):
+                self.throttle.scope = scope
+                self.assertIsNotNone(self.throttle.parse_rate(self.throttle.get_rate()))
 
 
-@ddt.ddt
 @mock.patch("django.conf.settings.USERNAME_REPLACEMENT_WORKER", "test_replace_username_service_worker")
 class UsernameReplacementViewTests(JwtMixin, APITestCase):
     """Tests UsernameReplacementView"""
@@ -672,12 +753,14 @@ class UsernameReplacementViewTests(JwtMixin, APITestCase):
         response = self.call_api(self.service_user, data)
         self.assertEqual(response.status_code, 200)
 
-    @ddt.data([{}, {}], {}, [{"test_key": "test_value", "test_key_2": "test_value_2"}])
-    def test_bad_schema(self, mapping_data):
+    def test_bad_schema(self):
         """Verify the endpoint rejects bad data schema"""
-        data = {"username_mappings": mapping_data}
-        response = self.call_api(self.service_user, data)
-        self.assertEqual(response.status_code, 400)
+        bad_mappings = ([{}, {}], {}, [{"test_key": "test_value", "test_key_2": "test_value_2"}])
+        for mapping_data in bad_mappings:
+            with self.subTest(mapping_data=mapping_data):
+                data = {"username_mappings": mapping_data}
+                response = self.call_api(self.service_user, data)
+                self.assertEqual(response.status_code, 400)
 
     def test_existing_and_non_existing_users(self):
         """
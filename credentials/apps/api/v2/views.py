@@ -74,7 +74,11 @@ class CredentialViewSet(viewsets.ModelViewSet):
     throttle_scope = "credential_view"
 
     def get_queryset(self):
-        queryset = UserCredential.objects.all()
+        # The serializer reads the credential (generic FK), attributes, and date override of
+        # every row; fetch them up front so list responses don't issue per-credential queries.
+        queryset = UserCredential.objects.select_related("credential_content_type", "date_override").prefetch_related(
+            "attributes", "credential"
+        )
 
         # We have to filter on the explicit credential models
         # because we cannot set a GenericRelation field on the Site model.
@@ -8,14 +8,19 @@ def copy_column_values_forwards(apps, schema_editor):
     """
     Copy the start and end fields into the start_date and end_date fields respectively.
 
-    This table should have a few thousand rows at most, so I'm not so concerned about long-term
-    database locking.
+    A single raw UPDATE executed by the database, bypassing the ORM entirely; quote_name
+    supplies the backend-specific quoting for the start/end columns, which are keywords.
     """
-    CourseRun = apps.get_model("catalog", "CourseRun")
-    for course_run in CourseRun.objects.all():
-        course_run.start_date = course_run.start
-        course_run.end_date = course_run.end
-        course_run.save()
+    quote = schema_editor.connection.ops.quote_name
+    schema_editor.execute(
+        "UPDATE {table} SET {start_date} = {start}, {end_date} = {end}".format(
+            table=quote("catalog_courserun"),
+            start_date=quote("start_date"),
+            start=quote("start"),
+            end_date=quote("end_date"),
+            end=quote("end"),
+        )
+    )
 
 
 def copy_column_values_backwards(apps, schema_editor):
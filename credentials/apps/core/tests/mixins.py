@@ -13,17 +13,26 @@ JSON = "application/json"
 
 
 class SiteMixin:
+    # Domain used for all test requests
+    domain = "testserver.fake"
+
+    # Test classes may provide a class-level client (e.g. built once in setUpClass)
+    # to skip the per-test client construction below.
+    shared_client = None
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        Site.objects.all().delete()
+        cls.site_configuration = SiteConfigurationFactory(site__domain=cls.domain, site__id=settings.SITE_ID)
+        cls.site = cls.site_configuration.site
+
     def setUp(self):
         super().setUp()
         cache.clear()
 
-        # Set the domain used for all test requests
-        domain = "testserver.fake"
-        self.client = self.client_class(SERVER_NAME=domain)
-
-        Site.objects.all().delete()
-        self.site_configuration = SiteConfigurationFactory(site__domain=domain, site__id=settings.SITE_ID)
-        self.site = self.site_configuration.site
+        self.client = self.shared_client or self.client_class(SERVER_NAME=self.domain)
 
         # Clear edx rest api client cache
         TieredCache.dangerous_clear_all_tiers()